@@ -56,6 +56,12 @@ class head(list):  # pylint: disable=invalid-name
             super().append(item)
 
 
+def format_event_log_line(event: SctEvent) -> str:
+    if event.source_timestamp:
+        return f"{event.formatted_event_timestamp} <{event.formatted_source_timestamp}>: {str(event).strip()}"
+    return f"{event.formatted_event_timestamp}: {str(event).strip()}"
+
+
 class EventsFileLogger(BaseEventsProcess[Tuple[str, Any], None], multiprocessing.Process):
     def __init__(self, _registry: EventsProcessesRegistry):
         base_dir: Path = get_events_main_device(_registry=_registry).events_log_base_dir
@@ -86,11 +92,7 @@ class EventsFileLogger(BaseEventsProcess[Tuple[str, Any], None], multiprocessing
                 self.write_event(event=event)
 
     def write_event(self, event: SctEvent) -> None:
-        if event.source_timestamp:
-            message = f"{event.formatted_event_timestamp} <{event.formatted_source_timestamp}>: {str(event).strip()}"
-        else:
-            message = f"{event.formatted_event_timestamp}: {str(event).strip()}"
-
+        message = format_event_log_line(event)
         message_bin = message.encode("utf-8") + b"\n"
 
         if event.severity not in (Severity.DEBUG, Severity.WARNING):
@@ -160,5 +162,5 @@ def get_logger_event_summary(_registry: Optional[EventsProcessesRegistry] = None
     return {}
 
 
-__all__ = ("EventsFileLogger",
+__all__ = ("EventsFileLogger", "format_event_log_line",
            "start_events_logger", "get_events_logger", "get_events_grouped_by_category", "get_logger_event_summary", )
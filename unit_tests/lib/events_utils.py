@@ -14,27 +14,74 @@
 import time
 import shutil
 import tempfile
+import threading
+import collections
 import unittest.mock
+from typing import Tuple, Any, Optional, Union
+from pathlib import Path
 from contextlib import contextmanager
 
-from sdcm.sct_events.setup import EVENTS_DEVICE_START_DELAY, start_events_device, stop_events_device
+from sdcm.sct_events.setup import EVENTS_DEVICE_START_DELAY, EVENTS_SUBSCRIBERS_START_DELAY, \
+    EVENTS_PROCESS_STOP_TIMEOUT, start_events_device, stop_events_device
+from sdcm.sct_events.base import SctEvent
 from sdcm.sct_events.events_device import start_events_main_device, get_events_main_device
-from sdcm.sct_events.file_logger import get_events_logger
-from sdcm.sct_events.events_processes import EventsProcessesRegistry
+from sdcm.sct_events.file_logger import get_events_logger, format_event_log_line
+from sdcm.sct_events.events_processes import EventsProcessesRegistry, BaseEventsProcess, verbose_suppress
 from sdcm.sct_events.event_counter import get_events_counter
 
 
+EVENTS_MEMORY_LOGGER_ID = "EVENTS_MEMORY_LOGGER"
+
+
+class EventsMemoryLogger(BaseEventsProcess[Tuple[str, Any], None], threading.Thread):
+    """Keep the lines EventsFileLogger would write to events.log in memory."""
+
+    def __init__(self, _registry: EventsProcessesRegistry):
+        self.captured = collections.deque()
+        self._captured_condition = threading.Condition()
+
+        super().__init__(_registry=_registry)
+
+    def run(self) -> None:
+        for event_tuple in self.inbound_events():
+            with verbose_suppress("EventsMemoryLogger failed to process %s", event_tuple):
+                _, event = event_tuple  # try to unpack event from EventsDevice
+                self.write_event(event=event)
+
+    def write_event(self, event: SctEvent) -> None:
+        if not getattr(event, 'save_to_files', False):
+            return
+        message = format_event_log_line(event)
+        with self._captured_condition:
+            self.captured.append(message)
+            self._captured_condition.notify_all()
+
+    @contextmanager
+    def wait_for_n_events(self, count: int, timeout: float = 1):
+        """Wake up as soon as `count' more events are captured, without polling."""
+        with self._captured_condition:
+            last_event_n = len(self.captured) + count
+
+        yield
+
+        with self._captured_condition:
+            assert self._captured_condition.wait_for(lambda: len(self.captured) >= last_event_n, timeout=timeout), \
+                f"{self} didn't capture {count} events in {timeout} seconds"
+
+
 class EventsUtilsMixin:
     temp_dir = None
     events_processes_registry = None
     events_processes_registry_patcher = None
     events_main_device = None
+    events_memory_logger = None
 
     @classmethod
-    def setup_events_processes(cls, events_device: bool, events_main_device: bool, registry_patcher: bool):
+    def setup_events_processes(cls, events_device: bool, events_main_device: bool, registry_patcher: bool,  # pylint: disable=too-many-arguments
+                               events_memory_logger: bool = False, temp_dir_base: Optional[Union[str, Path]] = None):
         """TestConfig own copy of Events Device machinery."""
 
-        cls.temp_dir = tempfile.mkdtemp()
+        cls.temp_dir = tempfile.mkdtemp(dir=temp_dir_base)
         cls.events_processes_registry = EventsProcessesRegistry(log_dir=cls.temp_dir)
         if registry_patcher:
             cls.events_processes_registry_patcher = \
@@ -47,9 +94,15 @@ class EventsUtilsMixin:
             start_events_main_device(_registry=cls.events_processes_registry)
             time.sleep(EVENTS_DEVICE_START_DELAY)
         cls.events_main_device = get_events_main_device(_registry=cls.events_processes_registry)
+        if events_memory_logger:
+            cls.events_processes_registry.start_events_process(name=EVENTS_MEMORY_LOGGER_ID, klass=EventsMemoryLogger)
+            cls.events_memory_logger = cls.events_processes_registry.get_events_process(name=EVENTS_MEMORY_LOGGER_ID)
+            time.sleep(EVENTS_SUBSCRIBERS_START_DELAY)
 
     @classmethod
     def teardown_events_processes(cls):
+        if cls.events_memory_logger and cls.events_memory_logger.is_alive():
+            cls.events_memory_logger.stop(timeout=EVENTS_PROCESS_STOP_TIMEOUT)
         stop_events_device(_registry=cls.events_processes_registry)
         if cls.events_processes_registry_patcher:
             cls.events_processes_registry_patcher.stop()
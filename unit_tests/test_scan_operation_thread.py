@@ -6,16 +6,18 @@ test_scan_positive - positive scenario
 test_scan_negative_operation_timed_out - getting operation_timed_out in scan execution
 test_scan_negative_exception - getting operation_timed_out in scan execution (with and without nemesis)
 """
+import dataclasses
+from collections import namedtuple
 from pathlib import Path
-import os
 from threading import Event
 from importlib import reload
 from unittest.mock import MagicMock, patch
 import pytest
 from cassandra import OperationTimedOut, ReadTimeout
+from cassandra.cluster import Session  # pylint: disable=no-name-in-module
 
-# from sdcm.utils.operations_thread import ThreadParams
 from unit_tests.test_cluster import DummyDbCluster, DummyNode
+from unit_tests.lib.events_utils import EventsUtilsMixin
 from sdcm.utils.decorators import retrying, Retry
 import sdcm.scan_operation_thread
 from sdcm.scan_operation_thread import ScanOperationThread, ThreadParams, PrometheusDBStats
@@ -29,14 +31,20 @@ def mock_retrying_decorator(*args, **kwargs):  # pylint: disable=unused-argument
 with patch('sdcm.utils.decorators.retrying', mock_retrying_decorator):
     reload(sdcm.scan_operation_thread)
 
-DEFAULT_PARAMS = {
-    'termination_event': Event(),
-    'user': 'sla_role_name',
-    'user_password': 'sla_role_password',
-    'duration': 10,
-    'interval': 0,
-    'validate_data': True
-}
+DEFAULT_PARAMS = ThreadParams(
+    mode='table',
+    ks_cf='a.b',
+    user='sla_role_name',
+    user_password='sla_role_password',
+    duration=10,
+    interval=0,
+    validate_data=True
+)
+
+SHM_DIR = Path("/dev/shm")
+
+# rows returned by the driver are namedtuples by default, only the columns the scan reads are needed
+MOCK_ROW = namedtuple('Row', ['pk', 'ck', 'v'])(pk=1, ck=1, v=1)
 
 
 class DBCluster(DummyDbCluster):  # pylint: disable=abstract-method
@@ -56,51 +64,75 @@ class DBCluster(DummyDbCluster):  # pylint: disable=abstract-method
         return self.connection_mock
 
 
-def get_event_log_file(events):
-    if (log_file := Path(events.temp_dir, "events_log", "events.log")).exists():
-        return log_file.read_text(encoding="utf-8").rstrip().split('\n')
-    return ""
+@pytest.fixture(scope='session')
+def module_events(tmp_path_factory):
+    class LocalMixing(EventsUtilsMixin):
+        pass
+    mixing = LocalMixing()
+    # the main events device still writes raw_events.log for every event, keep it on tmpfs when possible
+    temp_dir_base = SHM_DIR if SHM_DIR.is_dir() else tmp_path_factory.mktemp("events")
+    mixing.setup_events_processes(events_device=False, events_main_device=True, registry_patcher=True,
+                                  events_memory_logger=True, temp_dir_base=temp_dir_base)
+    yield mixing
+
+    mixing.teardown_events_processes()
+
+
+def get_captured_events(events):
+    # snapshot, so events arriving after the wait can't shift what the assertions look at
+    return list(events.events_memory_logger.captured)
 
 
 @pytest.fixture(scope='function', autouse=True)
-def cleanup_event_log_file(events):
-    with open(os.path.join(events.temp_dir, "events_log", "events.log"), 'r+', encoding="utf-8") as file:
-        file.truncate(0)
+def clear_captured_events(module_events):  # pylint: disable=redefined-outer-name
+    module_events.events_memory_logger.captured.clear()
 
 
-@pytest.fixture(scope='module', autouse=True)
+@pytest.fixture(scope='session', autouse=True)
 def mock_get_partition_keys():
-    with patch('sdcm.scan_operation_thread.get_partition_keys'):
-        yield
+    # partition scans pick a random key from this list, so it has to be non-empty
+    original_get_partition_keys = sdcm.scan_operation_thread.get_partition_keys
+    sdcm.scan_operation_thread.get_partition_keys = lambda *args, **kwargs: [1]
+    yield
+
+    sdcm.scan_operation_thread.get_partition_keys = original_get_partition_keys
 
 
-@pytest.fixture(scope='module')
+@pytest.fixture
+def termination_event():
+    return Event()
+
+
+@pytest.fixture(scope='session')
 def node():
     return DummyNode(name='test_node',
                      parent_cluster=None,
                      ssh_login_info=dict(key_file='~/.ssh/scylla-test'))
 
 
-class MockCqlConnectionPatient(MagicMock):
-    def execute_async(*args, **kwargs):
+class MockFuture:
+    # pylint: disable=too-few-public-methods
+    has_more_pages = False
+
+    def add_callbacks(self, callback, errback):
         # pylint: disable=unused-argument
-        # pylint: disable=no-method-argument
-        class MockFuture:
-            # pylint: disable=too-few-public-methods
-            has_more_pages = False
+        # pylint: disable=no-self-use
+        callback([MOCK_ROW])
 
-            def add_callbacks(self, callback, errback):
-                # pylint: disable=unused-argument
-                # pylint: disable=no-self-use
-                callback([MagicMock()])
-        return MockFuture()
 
-    events = ["Dispatching forward_request to 1 endpoints"]
+def make_connection(raise_in=None, exc=None):
+    """Mock of a CQL session, `raise_in` is the name of the method which raises `exc`."""
+    connection = MagicMock(spec_set=Session, name="MockCqlConnectionPatient")
+    connection.__enter__.return_value = connection
+    connection.execute_async.side_effect = lambda *args, **kwargs: MockFuture()
+    if raise_in:
+        getattr(connection, raise_in).side_effect = exc
+    return connection
 
 
-@pytest.fixture(scope='module', name="cluster")
+@pytest.fixture(scope='session', name="cluster")
 def new_cluster(node):  # pylint: disable=redefined-outer-name
-    db_cluster = DBCluster(MockCqlConnectionPatient(), [node], {})
+    db_cluster = DBCluster(make_connection(), [node], {})
     node.parent_cluster = db_cluster
 
     def tester_obj():
@@ -120,163 +152,110 @@ def new_cluster(node):  # pylint: disable=redefined-outer-name
 
 
 @pytest.mark.parametrize("mode", ['table', 'partition', 'aggregate'])
-def test_scan_positive(mode, events, cluster):  # pylint: disable=redefined-outer-name
-    default_params = ThreadParams(
+def test_scan_positive(mode, module_events, cluster, termination_event):  # pylint: disable=redefined-outer-name
+    default_params = dataclasses.replace(
+        DEFAULT_PARAMS,
         db_cluster=cluster,
-        ks_cf='a.b',
-        mode=mode,
-        **DEFAULT_PARAMS
+        termination_event=termination_event,
+        mode=mode
     )
     with patch.object(PrometheusDBStats, '__init__', return_value=None):
         with patch.object(PrometheusDBStats, 'query', return_value=[{'values': [[0, '1'], [1, '2']]}]):
-            with events.wait_for_n_events(events.get_events_logger(), count=2, timeout=10):
+            with module_events.events_memory_logger.wait_for_n_events(count=2, timeout=10):
                 ScanOperationThread(default_params)._run_next_operation()  # pylint: disable=protected-access
-            all_events = get_event_log_file(events)
+            all_events = get_captured_events(module_events)
             assert "Severity.NORMAL" in all_events[0] and "period_type=begin" in all_events[0]
             assert "Severity.NORMAL" in all_events[1] and "period_type=end" in all_events[1]
             if mode == "aggregate":
                 assert "MockCqlConnectionPatient" in all_events[1]
 
 
-def test_negative_prometheus_validation_error(events, cluster):
-    default_params = ThreadParams(
+def test_negative_prometheus_validation_error(module_events, cluster, termination_event):  # pylint: disable=redefined-outer-name
+    default_params = dataclasses.replace(
+        DEFAULT_PARAMS,
         db_cluster=cluster,
-        ks_cf='a.b',
-        mode="aggregate",
-        **DEFAULT_PARAMS
+        termination_event=termination_event,
+        mode="aggregate"
     )
     with patch.object(PrometheusDBStats, '__init__', return_value=None):
         with patch.object(PrometheusDBStats, 'query', return_value=[{'values': [[0, '1'], [1, '1']]}]):
-            with events.wait_for_n_events(events.get_events_logger(), count=2, timeout=2):
+            with module_events.events_memory_logger.wait_for_n_events(count=2, timeout=2):
                 ScanOperationThread(default_params)._run_next_operation()  # pylint: disable=protected-access
-            all_events = get_event_log_file(events)
+            all_events = get_captured_events(module_events)
             assert "Severity.NORMAL" in all_events[0] and "period_type=begin" in all_events[0]
             assert "Severity.ERROR" in all_events[1] and "period_type=end" in all_events[
                 1] and "Fullscan failed - 'forward_service_requests_dispatched_to_other_nodes' was not triggered" in all_events[1]
 
 
-class ExecuteOperationTimedOutMockCqlConnectionPatient(MockCqlConnectionPatient):
-    def execute(*args, **kwargs):
-        # pylint: disable=unused-argument
-        # pylint: disable=no-method-argument
-        raise OperationTimedOut("timeout")
-
-
-class ExecuteAsyncOperationTimedOutMockCqlConnectionPatient(MockCqlConnectionPatient):
-    def execute_async(*args, **kwargs):
-        # pylint: disable=unused-argument
-        # pylint: disable=no-method-argument
-        raise OperationTimedOut("timeout")
-
-
 @pytest.mark.parametrize(("mode", 'severity', 'timeout', 'execute_mock'),
                          [['partition', 'WARNING', 0, 'execute_async'],
                           ['aggregate', 'ERROR', 60*30, 'execute'],
                           ['table', 'WARNING', 0, 'execute']])
-def test_scan_negative_operation_timed_out(mode, severity, timeout, execute_mock, events, node):
+def test_scan_negative_operation_timed_out(mode, severity, timeout, execute_mock, module_events, cluster,
+                                           monkeypatch, termination_event):
     # pylint: disable=redefined-outer-name
     # pylint: disable=too-many-arguments
-    if execute_mock == 'execute_async':
-        connection = ExecuteAsyncOperationTimedOutMockCqlConnectionPatient()
-    else:
-        connection = ExecuteOperationTimedOutMockCqlConnectionPatient()
-    db_cluster = DBCluster(connection, [node], {})
-    node.parent_cluster = db_cluster
-    default_params = ThreadParams(
-        db_cluster=db_cluster,
-        ks_cf='a.b',
+    connection = make_connection(raise_in=execute_mock, exc=OperationTimedOut("timeout"))
+    monkeypatch.setattr(cluster, 'connection_mock', connection)
+    default_params = dataclasses.replace(
+        DEFAULT_PARAMS,
+        db_cluster=cluster,
+        termination_event=termination_event,
         mode=mode,
         full_scan_aggregates_operation_limit=timeout,
-        full_scan_operation_limit=timeout,
-        **DEFAULT_PARAMS
+        full_scan_operation_limit=timeout
     )
-    with events.wait_for_n_events(events.get_events_logger(), count=2, timeout=10):
+    with module_events.events_memory_logger.wait_for_n_events(count=2, timeout=10):
         ScanOperationThread(default_params)._run_next_operation()  # pylint: disable=protected-access
-    all_events = get_event_log_file(events)
+    all_events = get_captured_events(module_events)
     assert "Severity.NORMAL" in all_events[0] and "period_type=begin" in all_events[0]
     assert f"Severity.{severity}" in all_events[1] and "period_type=end" in all_events[1]
 
 
-class ExecuteReadTimeoutMockCqlConnectionPatient1(MockCqlConnectionPatient):
-    def execute(*args, **kwargs):
-        # pylint: disable=unused-argument
-        # pylint: disable=no-method-argument
-        raise ReadTimeout("Operation timed out")
-
-
-class ExecuteReadTimeoutMockCqlConnectionPatient2(MockCqlConnectionPatient):
-    def execute(*args, **kwargs):
-        # pylint: disable=unused-argument
-        # pylint: disable=no-method-argument
-        raise ReadTimeout("some another reason")
-
-
-@pytest.mark.parametrize(('execute_mock', "expected_message"),
-                         [[ExecuteReadTimeoutMockCqlConnectionPatient1, "operation failed due to operation timed out"],
-                          [ExecuteReadTimeoutMockCqlConnectionPatient2, "operation failed, ReadTimeout error"]])
-def test_scan_negative_read_timedout(execute_mock, expected_message, events, node):
+@pytest.mark.parametrize(('read_timeout', "expected_message"),
+                         [[ReadTimeout("Operation timed out"), "operation failed due to operation timed out"],
+                          [ReadTimeout("some another reason"), "operation failed, ReadTimeout error"]])
+def test_scan_negative_read_timedout(read_timeout, expected_message, module_events, cluster,
+                                     monkeypatch, termination_event):
     # pylint: disable=redefined-outer-name
     # pylint: disable=too-many-arguments
 
-    connection = execute_mock()
-    db_cluster = DBCluster(connection, [node], {})
-    node.parent_cluster = db_cluster
-    default_params = ThreadParams(
-        db_cluster=db_cluster,
-        ks_cf='a.b',
+    monkeypatch.setattr(cluster, 'connection_mock', make_connection(raise_in='execute', exc=read_timeout))
+    default_params = dataclasses.replace(
+        DEFAULT_PARAMS,
+        db_cluster=cluster,
+        termination_event=termination_event,
         mode='aggregate',
         full_scan_aggregates_operation_limit=60*30,
-        full_scan_operation_limit=300,
-        **DEFAULT_PARAMS
+        full_scan_operation_limit=300
     )
-    with events.wait_for_n_events(events.get_events_logger(), count=2, timeout=10):
+    with module_events.events_memory_logger.wait_for_n_events(count=2, timeout=10):
         ScanOperationThread(default_params)._run_next_operation()  # pylint: disable=protected-access
-    all_events = get_event_log_file(events)
+    all_events = get_captured_events(module_events)
     assert "Severity.NORMAL" in all_events[0] and "period_type=begin" in all_events[0]
     assert "Severity.ERROR" in all_events[1] and "period_type=end" in all_events[1]
     assert expected_message in all_events[1]
 
 
-class ExecuteExceptionMockCqlConnectionPatient(MockCqlConnectionPatient):
-    def execute(*args, **kwargs):
-        # pylint: disable=unused-argument
-        # pylint: disable=no-method-argument
-        raise Exception("Exception")
-
-
-class ExecuteAsyncExceptionMockCqlConnectionPatient(MockCqlConnectionPatient):
-    def execute_async(*args, **kwargs):
-        # pylint: disable=unused-argument
-        # pylint: disable=no-method-argument
-        raise Exception("Exception")
-
-
 @pytest.mark.parametrize(("running_nemesis", 'severity'), [[True, 'WARNING'], [False, 'ERROR']])
 @pytest.mark.parametrize(('mode', 'execute_mock'), [
     ['partition', 'execute_async'],
     ['aggregate', 'execute'],
     ['table', 'execute']])
-def test_scan_negative_exception(mode, severity, running_nemesis, execute_mock, events, node):
+def test_scan_negative_exception(mode, severity, running_nemesis, execute_mock, module_events, node,
+                                 cluster, monkeypatch, termination_event):
     # pylint: disable=redefined-outer-name
     # pylint: disable=too-many-arguments
-    if running_nemesis:
-        node.running_nemesis = MagicMock()
-    else:
-        node.running_nemesis = None
-    if execute_mock == 'execute_async':
-        connection = ExecuteAsyncExceptionMockCqlConnectionPatient()
-    else:
-        connection = ExecuteExceptionMockCqlConnectionPatient()
-    db_cluster = DBCluster(connection, [node], {})
-    node.parent_cluster = db_cluster
-    default_params = ThreadParams(
-        db_cluster=db_cluster,
-        ks_cf='a.b',
-        mode=mode,
-        ** DEFAULT_PARAMS
+    monkeypatch.setattr(node, 'running_nemesis', MagicMock() if running_nemesis else None)
+    monkeypatch.setattr(cluster, 'connection_mock', make_connection(raise_in=execute_mock, exc=Exception("Exception")))
+    default_params = dataclasses.replace(
+        DEFAULT_PARAMS,
+        db_cluster=cluster,
+        termination_event=termination_event,
+        mode=mode
     )
-    with events.wait_for_n_events(events.get_events_logger(), count=2, timeout=10):
+    with module_events.events_memory_logger.wait_for_n_events(count=2, timeout=10):
         ScanOperationThread(default_params)._run_next_operation()  # pylint: disable=protected-access
-    all_events = get_event_log_file(events)
+    all_events = get_captured_events(module_events)
     assert "Severity.NORMAL" in all_events[0] and "period_type=begin" in all_events[0]
     assert f"Severity.{severity}" in all_events[1] and "period_type=end" in all_events[1]